@@ -0,0 +1,159 @@
+from hpo_algorithm import HPOAlgorithm
+from trial import TrialHistory, TrialScheduler
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import inspect
+
+
+def subprocess_objective(build_command, parse_output=None):
+    """
+    Creates an async objective that evaluates configurations in a subprocess.
+
+    The subprocess is killed if the evaluation is cancelled, e.g. when it
+    exceeds the per-trial timeout of run_async().
+
+    Args:
+        build_command (callable): Function mapping a configuration and budget to the command arguments.
+        parse_output (callable, optional): Function mapping the decoded stdout to the metric value.
+                                           Defaults to parsing the last line as a float.
+
+    Returns:
+        callable: Async function mapping a configuration and budget to the metric value.
+    """
+
+    if parse_output is None:
+        parse_output = lambda stdout: float(stdout.strip().splitlines()[-1])
+
+    async def objective(config, budget):
+        process = await asyncio.create_subprocess_exec(
+            *build_command(config, budget),
+            stdout=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, _ = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Command exited with status {process.returncode}")
+        return parse_output(stdout.decode())
+
+    return objective
+
+
+async def run_async(
+    optimiser: HPOAlgorithm,
+    objective,
+    budget: float,
+    min_budget: float,
+    max_concurrency: int = 4,
+    timeout: float = None,
+    failure_value: float = 0.0,
+    semaphore: asyncio.Semaphore = None,
+) -> TrialHistory:
+    """
+    Runs an optimiser against an async objective with concurrent evaluations.
+
+    Trials are proposed and told through a TrialScheduler, so the budget
+    and result order follow the other drivers.
+
+    Args:
+        optimiser (HPOAlgorithm): The optimiser proposing configurations.
+        objective (callable): Function mapping a configuration and budget to the metric value.
+                              Synchronous functions are run in threads. A thread cannot be
+                              interrupted, so a timed out evaluation keeps its concurrency slot
+                              until it returns, and the run only returns once it has finished.
+        budget (float): Total evaluation budget.
+        min_budget (float): Minimum budget per evaluation, used as the cost unit.
+        max_concurrency (int, optional): Maximum number of concurrent evaluations. Defaults to 4.
+        timeout (float, optional): Seconds after which an evaluation is cancelled. Defaults to None.
+        failure_value (float, optional): Result told for failed or timed out trials. Defaults to 0.0.
+        semaphore (asyncio.Semaphore, optional): Semaphore shared with other runs to cap their
+                                                 combined concurrency. Defaults to a new one.
+
+    Returns:
+        TrialHistory: The trials told to the optimiser.
+    """
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Awaiting the float returned by a synchronous objective would fail every trial
+    is_async = inspect.iscoroutinefunction(objective) or inspect.iscoroutinefunction(getattr(objective, "__call__", None))
+    executor = None if is_async else ThreadPoolExecutor(max_workers=max_concurrency)
+    thread_slots = asyncio.Semaphore(max_concurrency) # threads of this run, abandoned ones included
+    threads = set()
+
+    def _release(future):
+        threads.discard(future)
+        semaphore.release()
+        thread_slots.release()
+        # Retrieve the exception of abandoned threads so it is not logged as unhandled
+        if not future.cancelled():
+            future.exception()
+
+    async def _call(config, _budget):
+        if is_async:
+            async with semaphore:
+                return await asyncio.wait_for(objective(config, _budget), timeout)
+
+        # Hold both slots until the thread returns, also after a timeout, so that
+        # abandoned evaluations still count towards the concurrency cap
+        await thread_slots.acquire()
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            thread_slots.release()
+            raise
+        future = asyncio.get_running_loop().run_in_executor(executor, objective, config, _budget)
+        threads.add(future)
+        future.add_done_callback(_release)
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    async def _evaluate(config, _budget):
+        try:
+            return float(await _call(config, _budget))
+        except asyncio.TimeoutError:
+            print(f"Trial timed out after {timeout} s")
+        except Exception as e:
+            print(f"Trial failed: {e}")
+        return failure_value
+
+    scheduler = TrialScheduler(optimiser, budget, min_budget)
+    tasks = {}
+
+    try:
+        while True:
+            # Propose new trials while the optimiser and budget allow it
+            while len(tasks) < max_concurrency and scheduler.can_propose():
+                trial = scheduler.propose()
+                if trial is None:
+                    break
+
+                key, config, _budget, _ = trial
+                tasks[asyncio.create_task(_evaluate(config, _budget))] = key
+
+            if not tasks:
+                break
+
+            # Wait for the next evaluation and tell results in proposal order
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                scheduler.complete(tasks.pop(task), task.result())
+    finally:
+        # Cancel outstanding evaluations if the run itself is cancelled
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Wait for abandoned threads, which cannot be cancelled
+        await asyncio.gather(*threads, return_exceptions=True)
+        if executor is not None:
+            executor.shutdown()
+
+    history = scheduler.history
+    print(f"Budget Used: {history.used_budget:0.2f} / {budget}")
+    print(f"Total Runs: {len(history)}")
+    return history
@@ -1,5 +1,5 @@
 from ConfigSpace import ConfigurationSpace
-from hpo_algorithm import HPOAlgorithm
+from hpo_algorithm import FidelitySpace, HPOAlgorithm
 import numpy as np
 from sklearn.gaussian_process import GaussianProcessRegressor
 from scipy.stats import norm
@@ -20,6 +20,9 @@ class BayesianOptimisation(HPOAlgorithm):
         min_budget: int,
         max_budget: int,
         seed: int = None,
+        fidelity_space: FidelitySpace = None,
+        init_design: str = "random",
+        n_design: int = 5,
     ) -> None:
         """
         Initialises the BayesianOptimisation class.
@@ -30,9 +33,15 @@ class BayesianOptimisation(HPOAlgorithm):
             min_budget (int): Minimum budget per evaluation.
             max_budget (int): Maximum budget per evaluation.
             seed (int, optional): Random seed for reproducibility. Defaults to None.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
+            init_design (str, optional): Initial design, one of "random", "sobol" or "lhs".
+                                         Defaults to "random".
+            n_design (int, optional): Size of the initial design, 0 for subclasses that
+                                      build their own. Defaults to 5.
         """
 
-        super().__init__(cs, total_budget, min_budget, max_budget, seed)
+        super().__init__(cs, total_budget, min_budget, max_budget, seed, fidelity_space)
         
         # Gaussian Process surrogate model
         self.gp = GaussianProcessRegressor()
@@ -41,8 +50,8 @@ class BayesianOptimisation(HPOAlgorithm):
         ratio = max_budget / min_budget
         self.n_init = int(total_budget / ratio)
 
-        # Initialise with 5 random configurations
-        self.configs = self.sample(5)
+        # Initialise with n_design configurations from the initial design
+        self.configs = self.design(n_design, init_design) if n_design > 0 else []
         self.evals = []
         self.idx = 0
 
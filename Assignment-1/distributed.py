@@ -0,0 +1,577 @@
+from hpo_algorithm import HPOAlgorithm
+from trial import TrialHistory, TrialScheduler
+from contextlib import contextmanager
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class TrialQueue:
+    """
+    SQLite-backed job queue shared by a coordinator and its workers.
+
+    Workers claim pending trials under a lease that they renew with
+    heartbeats. Trials whose lease expires (e.g. because the worker died)
+    are re-queued. To span machines the database file must live on a
+    filesystem with working file locks that all nodes can reach, and the
+    node clocks must be synchronised.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """
+        Opens (and if needed creates) the queue database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            timeout (float, optional): Seconds to wait for a database lock. Defaults to 30.
+        """
+
+        self.path: str = str(path)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS trials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                config TEXT NOT NULL,
+                budget REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires REAL,
+                result REAL
+            );
+            CREATE INDEX IF NOT EXISTS trials_status ON trials (status, id);
+            CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, last_seen REAL NOT NULL);
+            """
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        # Take the write lock up front so concurrent claims cannot interleave
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def clear(self) -> None:
+        """
+        Removes all trials and the run state.
+        """
+
+        with self._transaction():
+            self.conn.execute("DELETE FROM trials")
+            self.conn.execute("DELETE FROM state")
+
+    def start(self) -> str:
+        """
+        Starts a new run, removing the trials of any previous run.
+
+        Returns:
+            str: Identifier of the new run.
+        """
+
+        run_id = uuid.uuid4().hex
+        with self._transaction():
+            self.conn.execute("DELETE FROM trials")
+            self.conn.execute("DELETE FROM state")
+            self.conn.execute("INSERT INTO state (key, value) VALUES ('run', ?)", (run_id,))
+        return run_id
+
+    def stop(self) -> None:
+        """
+        Signals the workers of the current run to shut down.
+        """
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO state (key, value) SELECT 'stopped', value FROM state WHERE key = 'run'"
+        )
+
+    def active_run(self) -> str | None:
+        """
+        Returns the identifier of the current run, or None if no run is active.
+        """
+
+        state = dict(self.conn.execute("SELECT key, value FROM state").fetchall())
+        run_id = state.get("run")
+        if run_id is None or state.get("stopped") == run_id:
+            return None
+        return run_id
+
+    def touch(self, worker: str) -> None:
+        """
+        Records that a worker is alive.
+
+        Args:
+            worker (str): Identifier of the worker.
+        """
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO workers (id, last_seen) VALUES (?, ?)", (worker, time.time())
+        )
+
+    def last_seen(self) -> float | None:
+        """
+        Returns the time any worker was last seen alive, or None if no worker was seen.
+        """
+
+        return self.conn.execute("SELECT MAX(last_seen) FROM workers").fetchone()[0]
+
+    def submit(self, config: dict, budget: float) -> int:
+        """
+        Adds a trial to the queue.
+
+        Args:
+            config (dict): The configuration to evaluate.
+            budget (float): The budget to evaluate it at.
+
+        Returns:
+            int: Identifier of the queued trial.
+        """
+
+        # NumPy scalars returned by sample() are not JSON serialisable
+        data = json.dumps(config, default=lambda o: o.item())
+        cursor = self.conn.execute(
+            "INSERT INTO trials (config, budget) VALUES (?, ?)", (data, float(budget))
+        )
+        return cursor.lastrowid
+
+    def claim(self, worker: str, lease_timeout: float) -> tuple[int, dict, float] | None:
+        """
+        Claims the oldest pending trial for a worker.
+
+        Args:
+            worker (str): Identifier of the claiming worker.
+            lease_timeout (float): Seconds until the claim expires without a heartbeat.
+
+        Returns:
+            tuple[int, dict, float] or None: Trial id, configuration and budget,
+                                             or None if no trial is pending.
+        """
+
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT id, config, budget FROM trials WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE trials SET status = 'running', worker = ?, attempts = attempts + 1, "
+                    "lease_expires = ? WHERE id = ?",
+                    (worker, time.time() + lease_timeout, row[0]),
+                )
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def heartbeat(self, trial_id: int, worker: str, lease_timeout: float) -> bool:
+        """
+        Extends the lease of a running trial.
+
+        Args:
+            trial_id (int): Identifier of the trial.
+            worker (str): Identifier of the worker holding the lease.
+            lease_timeout (float): Seconds until the renewed lease expires.
+
+        Returns:
+            bool: True if the lease was renewed, False if it was lost.
+        """
+
+        cursor = self.conn.execute(
+            "UPDATE trials SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + lease_timeout, trial_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, trial_id: int, worker: str, result: float) -> bool:
+        """
+        Stores the result of a trial.
+
+        A result is accepted even if the lease was lost in the meantime, as
+        long as no other worker has completed the trial first.
+
+        Args:
+            trial_id (int): Identifier of the trial.
+            worker (str): Identifier of the worker reporting the result.
+            result (float): The observed metric value.
+
+        Returns:
+            bool: True if the result was stored, else False.
+        """
+
+        cursor = self.conn.execute(
+            "UPDATE trials SET status = 'done', worker = ?, result = ?, lease_expires = NULL "
+            "WHERE id = ? AND status IN ('pending', 'running')",
+            (worker, float(result), trial_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, trial_id: int, worker: str) -> bool:
+        """
+        Marks a trial as failed.
+
+        Args:
+            trial_id (int): Identifier of the trial.
+            worker (str): Identifier of the worker reporting the failure.
+
+        Returns:
+            bool: True if the trial was marked as failed, else False.
+        """
+
+        cursor = self.conn.execute(
+            "UPDATE trials SET status = 'failed', worker = ?, lease_expires = NULL "
+            "WHERE id = ? AND status IN ('pending', 'running')",
+            (worker, trial_id),
+        )
+        return cursor.rowcount == 1
+
+    def requeue_expired(self, max_attempts: int = 3) -> int:
+        """
+        Re-queues running trials whose lease has expired.
+
+        Trials that already used up max_attempts leases are marked as failed
+        instead, so a configuration that keeps crashing workers cannot stall
+        the sweep.
+
+        Args:
+            max_attempts (int, optional): Maximum number of claims per trial. Defaults to 3.
+
+        Returns:
+            int: Number of re-queued trials.
+        """
+
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE trials SET status = 'failed', lease_expires = NULL "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                (now, max_attempts),
+            )
+            cursor = self.conn.execute(
+                "UPDATE trials SET status = 'pending', worker = NULL, lease_expires = NULL "
+                "WHERE status = 'running' AND lease_expires < ?",
+                (now,),
+            )
+        return cursor.rowcount
+
+    def collect(self) -> list[tuple[int, float | None]]:
+        """
+        Returns finished trials that were not collected yet.
+
+        Returns:
+            list[tuple[int, float | None]]: Trial id and result, where the
+                                            result is None for failed trials.
+        """
+
+        with self._transaction():
+            rows = self.conn.execute(
+                "SELECT id, status, result FROM trials WHERE status IN ('done', 'failed') ORDER BY id"
+            ).fetchall()
+            self.conn.execute(
+                "UPDATE trials SET status = 'collected' WHERE status IN ('done', 'failed')"
+            )
+
+        return [(trial_id, result if status == 'done' else None) for trial_id, status, result in rows]
+
+
+class Coordinator:
+    """
+    Owns the optimiser state and hands out trials through a TrialQueue.
+
+    Trials are proposed and told through a TrialScheduler, so the budget
+    and result order follow the other drivers.
+    """
+
+    def __init__(
+        self,
+        optimiser: HPOAlgorithm,
+        queue: TrialQueue,
+        budget: float,
+        min_budget: float,
+        max_pending: int = None,
+        max_attempts: int = 3,
+        failure_value: float = 0.0,
+        poll_interval: float = 0.1,
+        worker_timeout: float = 300.0,
+    ) -> None:
+        """
+        Initialises the coordinator.
+
+        Args:
+            optimiser (HPOAlgorithm): The optimiser proposing configurations.
+            queue (TrialQueue): The queue shared with the workers.
+            budget (float): Total evaluation budget.
+            min_budget (float): Minimum budget per evaluation, used as the cost unit.
+            max_pending (int, optional): Maximum number of queued or running trials. Defaults to no limit.
+            max_attempts (int, optional): Maximum number of claims per trial. Defaults to 3.
+            failure_value (float, optional): Result told for failed trials. Defaults to 0.0.
+            poll_interval (float, optional): Seconds between queue polls. Defaults to 0.1.
+            worker_timeout (float, optional): Seconds without any live worker after which the
+                                              run is aborted while trials are pending. Defaults to 300.
+        """
+
+        self.optimiser: HPOAlgorithm = optimiser
+        self.queue: TrialQueue = queue
+        self.budget: float = budget
+        self.min_budget: float = min_budget
+        self.max_pending: int = max_pending
+        self.max_attempts: int = max_attempts
+        self.failure_value: float = failure_value
+        self.poll_interval: float = poll_interval
+        self.worker_timeout: float = worker_timeout
+
+    def run(self) -> TrialHistory:
+        """
+        Runs the optimisation until the budget or the optimiser is exhausted.
+
+        Returns:
+            TrialHistory: The trials told to the optimiser.
+
+        Raises:
+            RuntimeError: If trials are pending and no worker was alive for worker_timeout seconds.
+        """
+
+        self.queue.start()
+        start_time = time.time()
+        scheduler = TrialScheduler(self.optimiser, self.budget, self.min_budget)
+        keys = {} # queue trial id -> scheduler key
+
+        try:
+            while True:
+                self.queue.requeue_expired(self.max_attempts)
+
+                # Tell finished results in the order they were proposed
+                for trial_id, result in self.queue.collect():
+                    scheduler.complete(keys.pop(trial_id), self.failure_value if result is None else result)
+
+                # Propose new trials while the optimiser and budget allow it
+                while (
+                    (self.max_pending is None or len(scheduler) < self.max_pending)
+                    and scheduler.can_propose()
+                ):
+                    trial = scheduler.propose()
+                    if trial is None:
+                        break
+                    key, config, budget, _ = trial
+                    keys[self.queue.submit(config, budget)] = key
+
+                if scheduler.finished:
+                    break
+
+                # Give up instead of waiting forever if all workers are gone
+                last_seen = max(self.queue.last_seen() or start_time, start_time)
+                if len(scheduler) and time.time() - last_seen > self.worker_timeout:
+                    raise RuntimeError(
+                        f"No live worker for {self.worker_timeout} s with {len(scheduler)} trials pending"
+                    )
+                time.sleep(self.poll_interval)
+        finally:
+            self.queue.stop()
+
+        history = scheduler.history
+        print(f"Budget Used: {history.used_budget:0.2f} / {self.budget}")
+        print(f"Total Runs: {len(history)}")
+        return history
+
+
+class Worker:
+    """
+    Stateless worker that evaluates trials pulled from a TrialQueue.
+
+    The objective (e.g. a warm BenchmarkSet) is kept for the lifetime of
+    the worker, while a background thread renews the lease of the trial
+    being evaluated.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        objective,
+        worker_id: str = None,
+        lease_timeout: float = 60.0,
+        poll_interval: float = 0.5,
+    ) -> None:
+        """
+        Initialises the worker.
+
+        Args:
+            path (str): Path to the SQLite queue database.
+            objective (callable): Function mapping a configuration and budget to the metric value.
+            worker_id (str, optional): Identifier of the worker. Defaults to host, pid and a random suffix.
+            lease_timeout (float, optional): Seconds until a claim expires without a heartbeat. Defaults to 60.
+            poll_interval (float, optional): Seconds between polls of an empty queue. Defaults to 0.5.
+        """
+
+        self.path: str = str(path)
+        self.objective = objective
+        self.worker_id: str = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_timeout: float = lease_timeout
+        self.poll_interval: float = poll_interval
+
+    def _heartbeat(self, trial_id: int, done: threading.Event) -> None:
+        # SQLite connections cannot be shared between threads
+        queue = TrialQueue(self.path)
+        try:
+            while not done.wait(self.lease_timeout / 3):
+                queue.touch(self.worker_id)
+                if not queue.heartbeat(trial_id, self.worker_id, self.lease_timeout):
+                    break
+        finally:
+            queue.close()
+
+    def run(self) -> int:
+        """
+        Evaluates trials until the coordinator signals to stop.
+
+        A worker started before the coordinator, or on a queue left over from
+        a finished run, waits for a run to start. It follows the current run,
+        also when a new coordinator replaces a run whose coordinator died, and
+        exits once the current run is stopped.
+
+        Returns:
+            int: Number of trials evaluated by this worker.
+        """
+
+        queue = TrialQueue(self.path)
+        run_id = None
+        last_touch = 0.0
+        count = 0
+
+        try:
+            while True:
+                # Follow the current run, and leave once the run being served is stopped
+                active = queue.active_run()
+                if active is None and run_id is not None:
+                    break
+                run_id = active
+
+                # Report as alive, throttled to the lease renewal rate
+                if time.time() - last_touch > self.lease_timeout / 3:
+                    queue.touch(self.worker_id)
+                    last_touch = time.time()
+
+                task = queue.claim(self.worker_id, self.lease_timeout) if run_id is not None else None
+                if task is None:
+                    time.sleep(self.poll_interval)
+                    continue
+
+                trial_id, config, budget = task
+                done = threading.Event()
+                heartbeat = threading.Thread(target=self._heartbeat, args=(trial_id, done), daemon=True)
+                heartbeat.start()
+                try:
+                    result = float(self.objective(config, budget))
+                except Exception as e:
+                    print(f"Trial {trial_id} failed on {self.worker_id}: {e}")
+                    queue.fail(trial_id, self.worker_id)
+                    continue
+                finally:
+                    done.set()
+                    heartbeat.join()
+
+                queue.complete(trial_id, self.worker_id, result)
+                count += 1
+        finally:
+            queue.close()
+
+        return count
+
+
+def _run_benchmark_worker(path, scenario, instance, fidelity_param, metric, lease_timeout):
+    """
+    Runs a Worker holding a warm YAHPO benchmark.
+    """
+
+    from experiment import BenchmarkSet, load_fidelity_space, make_objective
+
+    bench = BenchmarkSet(scenario=scenario)
+    bench.set_instance(value=instance)
+    objective = make_objective(bench, scenario, load_fidelity_space(bench, fidelity_param), metric)
+
+    count = Worker(path, objective, lease_timeout=lease_timeout).run()
+    print(f"Worker finished after {count} trials")
+
+
+if __name__ == "__main__":
+    from random_search import RandomSearch
+    from bayesian_optimisation import BayesianOptimisation
+    from grid_search import GridSearch
+    from successive_halving import SuccessiveHalving
+    from trust_region_bo import TrustRegionBO
+
+    optimisers = {
+        cls.__name__: cls
+        for cls in [RandomSearch, BayesianOptimisation, GridSearch, SuccessiveHalving, TrustRegionBO]
+    }
+
+    parser = argparse.ArgumentParser(description="Coordinator/worker sweeps over a SQLite trial queue.")
+    parser.add_argument("role", choices=["coordinator", "worker"])
+    parser.add_argument("--queue", required=True, help="Path to the SQLite queue database.")
+    parser.add_argument("--scenario", default="rbv2_xgboost")
+    parser.add_argument("--instance", default="16")
+    parser.add_argument(
+        "--fidelity", default="trainsize",
+        help="Fidelity parameter, or several separated by commas that are scaled together.",
+    )
+    parser.add_argument("--metric", default="acc")
+    parser.add_argument("--optimiser", choices=list(optimisers), default="RandomSearch")
+    parser.add_argument("--budget", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--lease-timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Number of local worker processes started by the coordinator.",
+    )
+    args = parser.parse_args()
+
+    fidelity_param = tuple(args.fidelity.split(","))
+    worker_args = (args.queue, args.scenario, args.instance, fidelity_param, args.metric, args.lease_timeout)
+
+    if args.role == "worker":
+        _run_benchmark_worker(*worker_args)
+
+    else:
+        from experiment import BenchmarkSet, load_fidelity_space, save_history
+
+        bench = BenchmarkSet(scenario=args.scenario)
+        bench.set_instance(value=args.instance)
+        cs = bench.get_opt_space(drop_fidelity_params=True)
+        fidelity_space = load_fidelity_space(bench, fidelity_param)
+
+        optimiser_class = optimisers[args.optimiser]
+        optimiser = optimiser_class(
+            cs=cs, total_budget=args.budget, min_budget=fidelity_space.min_budget,
+            max_budget=fidelity_space.max_budget, seed=args.seed, fidelity_space=fidelity_space,
+        )
+        coordinator = Coordinator(optimiser, TrialQueue(args.queue), args.budget, fidelity_space.min_budget)
+
+        # Optionally start local workers for single-machine testing
+        processes = [
+            multiprocessing.Process(target=_run_benchmark_worker, args=worker_args)
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        history = coordinator.run()
+        for process in processes:
+            process.join()
+
+        save_history(
+            history, args.optimiser, args.scenario, args.instance, fidelity_space, args.budget, args.metric, args.seed
+        )
+        best = history.best
+        if best is not None:
+            print(f"Best Result: {best.result:.3f}")
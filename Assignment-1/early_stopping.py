@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class LearningCurveStopper:
+    """
+    Early-stopping rule based on extrapolated learning curves.
+
+    Each partial learning curve (metric value per budget) is extrapolated
+    to the maximum budget with a small ensemble of parametric curves. A
+    configuration is dropped if even its optimistic prediction is below the
+    pessimistic prediction of the best configuration.
+
+    As every curve family has two parameters, curves need at least three
+    observations before they are extrapolated, so that the fit residuals are
+    informative. The standard deviation of every prediction is floored at
+    min_std, on the scale of the metric, so that plateaued curves with nearly
+    identical values are not told apart with false confidence.
+    """
+
+    # Exponents of the power-law curves y = a - c * b^(-alpha)
+    ALPHAS = (0.5, 1.0, 2.0)
+
+    def __init__(
+        self,
+        max_budget: float,
+        min_points: int = 3,
+        n_std: float = 2.0,
+        bounds: tuple[float, float] = None,
+        min_std: float = None,
+    ) -> None:
+        """
+        Initialises the LearningCurveStopper.
+
+        Args:
+            max_budget (float): Budget the curves are extrapolated to.
+            min_points (int, optional): Observations needed before a curve is extrapolated,
+                                        at least 3. Defaults to 3.
+            n_std (float, optional): Width of the prediction interval in standard deviations. Defaults to 2.0.
+            bounds (tuple[float, float], optional): Range of the metric the predictions are
+                                                    clipped to. Defaults to no bounds.
+            min_std (float, optional): Lower bound on the standard deviation of a prediction.
+                                       Defaults to 1% of the width of bounds, or without bounds
+                                       to the spread of the latest observed values.
+        """
+
+        self.max_budget: float = max_budget
+        self.min_points: int = max(min_points, 3)
+        self.n_std: float = n_std
+        self.bounds: tuple[float, float] = bounds
+        if min_std is None and bounds is not None:
+            min_std = 0.01 * (bounds[1] - bounds[0])
+        self.min_std: float = min_std
+
+    def predict(self, curve: list[tuple[float, float]]) -> tuple[float, float] | None:
+        """
+        Predicts the value of a learning curve at the maximum budget.
+
+        Fits a power law for each exponent in ALPHAS and a logarithmic curve
+        by least squares, and combines their extrapolations. Each extrapolation
+        is clipped to at least the lowest observed value and to the metric bounds.
+
+        Args:
+            curve (list[tuple[float, float]]): Observed (budget, value) pairs.
+
+        Returns:
+            tuple[float, float] or None: Mean and standard deviation of the
+                                         prediction, or None if the curve is too short.
+        """
+
+        if len(curve) < self.min_points:
+            return None
+
+        b, y = np.array(curve, dtype=float).T
+        if np.unique(b).size < self.min_points:
+            return None
+
+        # One design matrix per curve family, evaluated at the observed budgets
+        # and at the maximum budget
+        features = [(-(b ** -alpha), -(self.max_budget ** -alpha)) for alpha in self.ALPHAS]
+        features.append((np.log(b), np.log(self.max_budget)))
+
+        predictions = []
+        residuals = []
+        for x, x_max in features:
+            A = np.column_stack([np.ones_like(b), x])
+            coef, _, _, _ = np.linalg.lstsq(A, y, rcond=None)
+            predictions.append(coef[0] + coef[1] * x_max)
+            residuals.append(y - A @ coef)
+
+        lower, upper = self.bounds if self.bounds is not None else (-np.inf, np.inf)
+        predictions = np.clip(predictions, max(y.min(), lower), upper)
+
+        # Spread across families plus the misfit of the families themselves
+        std = np.sqrt(np.var(predictions) + np.mean(np.square(residuals)))
+        return float(np.mean(predictions)), float(std)
+
+    def keep(self, curves: list[list[tuple[float, float]]]) -> list[int]:
+        """
+        Selects the configurations worth evaluating at the next budget.
+
+        Args:
+            curves (list[list[tuple[float, float]]]): Partial learning curve of each configuration.
+
+        Returns:
+            list[int]: Indices of the curves to keep.
+        """
+
+        predictions = [self.predict(curve) for curve in curves]
+        if not any(predictions):
+            return list(range(len(curves)))
+
+        # Floor the interval width on the scale of the metric
+        min_std = self.min_std
+        if min_std is None:
+            min_std = np.std([curve[-1][1] for curve in curves if curve])
+        intervals = [
+            None if prediction is None else (prediction[0], max(prediction[1], min_std))
+            for prediction in predictions
+        ]
+
+        incumbent = max(mean - self.n_std * std for mean, std in filter(None, intervals))
+        return [
+            i for i, interval in enumerate(intervals)
+            if interval is None or interval[0] + self.n_std * interval[1] >= incumbent
+        ]
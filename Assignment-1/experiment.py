@@ -3,7 +3,12 @@ from random_search import RandomSearch
 from bayesian_optimisation import BayesianOptimisation
 from grid_search import GridSearch
 from successive_halving import SuccessiveHalving
+from hpo_algorithm import FidelitySpace
+from simulator import simulate
+from trial import TrialHistory
 from yahpo_gym import BenchmarkSet, local_config
+from dataclasses import asdict
+import inspect
 import pickle
 import time
 
@@ -13,7 +18,120 @@ parent_path = Path(__file__).parent
 local_config.init_config()
 local_config.set_data_path((parent_path / "data").resolve())
 
-def run(optimiser_class, scenario, instance, fidelity_param, budget, metric, seed=None):
+# Surrogate-predicted training time of each scenario, used by the simulator
+RUNTIME_METRICS = {"nb301": "runtime", "rbv2_xgboost": "timetrain"}
+
+# Range of each target metric, used to clip extrapolated learning curves
+METRIC_BOUNDS = {"val_accuracy": (0.0, 100.0), "acc": (0.0, 1.0)}
+
+def load_fidelity_space(bench, fidelity_param):
+    """
+    Builds the fidelity space of a YAHPO benchmark.
+
+    Args:
+        bench (BenchmarkSet): The benchmark with its instance already set.
+        fidelity_param (str or tuple[str]): The fidelity parameter to control budget,
+                                            or several scaled together with the first.
+
+    Returns:
+        FidelitySpace: The fidelity space.
+    """
+
+    names = [fidelity_param] if isinstance(fidelity_param, str) else list(fidelity_param)
+    space = bench.get_fidelity_space()
+    return FidelitySpace([space[name] for name in names])
+
+def make_objective(bench, scenario, fidelity_space, metric, runtime_metric=None):
+    """
+    Wraps a YAHPO benchmark into an objective function.
+
+    Args:
+        bench (BenchmarkSet): The benchmark with its instance already set.
+        scenario (str): The YAHPO Gym benchmark scenario name.
+        fidelity_space (FidelitySpace): The fidelity parameters to control budget.
+        metric (str): The target metric to optimise.
+        runtime_metric (str, optional): If given, the objective also returns this
+                                        metric as the runtime. Defaults to None.
+
+    Returns:
+        callable: Function mapping a configuration and budget to the metric value,
+                  or to a (metric value, runtime) tuple if runtime_metric is given.
+    """
+
+    def objective(config, budget):
+        # Evaluate a copy so the optimiser's configuration is left unchanged
+        eval_config = {**config, **fidelity_space.values(budget)}
+        if scenario == 'rbv2_xgboost' and 'repl' not in eval_config: eval_config['repl'] = 10 # max value
+        results = bench.objective_function(eval_config)[0]
+        if runtime_metric is not None:
+            return results[metric], results[runtime_metric]
+        return results[metric]
+
+    return objective
+
+def kwargs_suffix(optimiser_class, optimiser_kwargs=None):
+    """
+    Builds a file name suffix from the optimiser arguments that differ from their defaults.
+
+    Args:
+        optimiser_class (class): The optimiser class.
+        optimiser_kwargs (dict, optional): Extra keyword arguments for the optimiser. Defaults to None.
+
+    Returns:
+        str: Suffix such as "_init_design-sobol", or "" if all arguments are defaults.
+    """
+
+    parameters = inspect.signature(optimiser_class.__init__).parameters
+    return "".join(
+        f"_{name}-{value}"
+        for name, value in sorted((optimiser_kwargs or {}).items())
+        if name not in parameters or parameters[name].default != value
+    )
+
+def save_history(history, optimiser_name, scenario, instance, fidelity_space, budget, metric, seed=None, suffix=""):
+    """
+    Saves the trials of a run to the pickle file read by results.ipynb.
+
+    Args:
+        history (TrialHistory): The trials of the run.
+        optimiser_name (str): Name of the optimiser class.
+        scenario (str): The YAHPO Gym benchmark scenario name.
+        instance (str): The specific instance of the scenario.
+        fidelity_space (FidelitySpace): The fidelity parameters to control budget.
+        budget (int): Total evaluation budget.
+        metric (str): The target metric to optimise.
+        seed (int, optional): Random seed of the run. Defaults to None.
+        suffix (str, optional): Suffix appended to the file name. Defaults to "".
+    """
+
+    with open(
+        (parent_path / f"results/pkl/{seed}/{optimiser_name}_{scenario}_{instance}_{budget}{suffix}.pkl").resolve(), "wb"
+    ) as f:
+        pickle.dump(history.to_rows(fidelity_space, metric), f)
+
+def save_early_stopping(optimiser, scenario, instance, budget, seed=None, suffix=""):
+    """
+    Saves how many configurations early stopping dropped and the budget this saved.
+
+    Args:
+        optimiser (HPOAlgorithm): The optimiser of the run.
+        scenario (str): The YAHPO Gym benchmark scenario name.
+        instance (str): The specific instance of the scenario.
+        budget (int): Total evaluation budget.
+        seed (int, optional): Random seed of the run. Defaults to None.
+        suffix (str, optional): Suffix appended to the file name. Defaults to "".
+    """
+
+    if getattr(optimiser, "stopper", None) is None:
+        return
+
+    name = type(optimiser).__name__
+    with open(
+        (parent_path / f"results/pkl/{seed}/{name}_{scenario}_{instance}_{budget}{suffix}_early_stopping.pkl").resolve(), "wb"
+    ) as f:
+        pickle.dump({"n_stopped": optimiser.n_stopped, "saved_budget": optimiser.saved_budget}, f)
+
+def run(optimiser_class, scenario, instance, fidelity_param, budget, metric, seed=None, n_workers=None, optimiser_kwargs=None):
     """
     Runs the given HPO algorithm on a YAHPO benchmark scenario.
 
@@ -21,10 +139,15 @@ def run(optimiser_class, scenario, instance, fidelity_param, budget, metric, see
         optimiser_class (class): The optimiser class to instantiate.
         scenario (str): The YAHPO Gym benchmark scenario name.
         instance (str): The specific instance of the scenario to optimize.
-        fidelity_param (str): The fidelity parameter to control budget.
+        fidelity_param (str or tuple[str]): The fidelity parameter to control budget, or
+                                            several scaled together with the first.
         budget (int): Total evaluation budget.
         metric (str): The target metric to optimise.
         seed (int, optional): Random seed for reproducibility. Defaults to None.
+        n_workers (int, optional): If given, simulates the run on this many parallel
+                                   workers using surrogate-predicted runtimes. Defaults to None.
+        optimiser_kwargs (dict, optional): Extra keyword arguments for the optimiser,
+                                           e.g. {"init_design": "sobol"}. Defaults to None.
 
     Returns:
         tuple: A tuple containing:
@@ -39,67 +162,101 @@ def run(optimiser_class, scenario, instance, fidelity_param, budget, metric, see
     
     # Retrieve configuration space and fidelity parameter values
     cs = bench.get_opt_space(drop_fidelity_params=True)
-    fidelity = bench.get_fidelity_space()[fidelity_param]
+    fidelity_space = load_fidelity_space(bench, fidelity_param)
+
+    # Early stopping clips its extrapolations to the range of the metric
+    kwargs = dict(optimiser_kwargs or {})
+    if kwargs.get("early_stopping"):
+        kwargs.setdefault("metric_bounds", METRIC_BOUNDS.get(metric))
 
     # Instantiate the optimiser
-    optimiser = optimiser_class(cs=cs, total_budget=budget, min_budget=fidelity.lower, max_budget=fidelity.upper, seed=seed)
+    optimiser = optimiser_class(
+        cs=cs, total_budget=budget, min_budget=fidelity_space.min_budget, max_budget=fidelity_space.max_budget,
+        seed=seed, fidelity_space=fidelity_space, **kwargs,
+    )
+
+    # Keep runs with different optimiser arguments in separate files
+    suffix = kwargs_suffix(optimiser_class, optimiser_kwargs)
 
-    runs = []
-    best_result = 0
-    best_config = {}
+    if n_workers is not None:
+        return _run_simulation(
+            optimiser, bench, scenario, instance, fidelity_space, budget, metric, seed, n_workers, suffix
+        )
+
+    objective = make_objective(bench, scenario, fidelity_space, metric)
+    history = TrialHistory(min_budget=fidelity_space.min_budget, cost_fn=optimiser.cost)
     count = 0
-    curr_budget = 0
-    budget_levels = [curr_budget]
 
     # Main optimisation loop
-    while curr_budget < budget:
+    while history.used_budget < budget:
         # Get the next configuration to evaluate
         config, _budget = optimiser.ask()
-        if _budget not in budget_levels:
-            budget_levels.append(_budget)
+        history.register_budget(_budget)
         
         # Exit loop if no more configs left to evaluate
         if config is None:
-            print(f"Budget Used: {curr_budget:0.2f} / {budget}")
+            print(f"Budget Used: {history.used_budget:0.2f} / {budget}")
             break
             
         # Count how many configurations are evaluated at initial budget
-        if len(budget_levels) == 2:
+        if len(history.budget_levels) == 2:
             count += 1
         
         # Evaluate the configuration on the benchmark
-        config[fidelity_param] = _budget
-        if scenario == 'rbv2_xgboost': config['repl'] = 10 # max value
-        result = bench.objective_function(config)[0][metric]
-
-        # Track the best result and config
-        if result > best_result:
-            best_result = result
-            best_config = config
+        result = objective(config, _budget)
 
         # Update the optimiser with the result
         optimiser.tell(result)
         
-        # Increment the budget
-        config['start_time'] = curr_budget # required for DeepCAVE
-        curr_budget += (budget_levels[-1] - budget_levels[-2]) / fidelity.lower
-        config['end_time'] = curr_budget # required for DeepCAVE
-
-        config[metric] = result
-        runs.append(config) # Store run info
+        # Store the trial and increment the budget
+        history.record(config, _budget, result)
     
-    if curr_budget >= budget:
-        print(f"Budget Exceeded: {curr_budget:0.2f} / {budget}")
+    if history.used_budget >= budget:
+        print(f"Budget Exceeded: {history.used_budget:0.2f} / {budget}")
 
-    print(f"Total Runs: {len(runs)}")
+    print(f"Total Runs: {len(history)}")
     
     # Save results to pickle file
+    save_history(history, optimiser_class.__name__, scenario, instance, fidelity_space, budget, metric, seed, suffix)
+    save_early_stopping(optimiser, scenario, instance, budget, seed, suffix)
+
+    # Return the best result and config
+    best = history.best
+    if best is None:
+        return {}, 0, count
+    return history.configs[best.config_id], best.result, count
+
+def _run_simulation(optimiser, bench, scenario, instance, fidelity_space, budget, metric, seed, n_workers, suffix=""):
+    """
+    Simulates the run on parallel workers and saves the trials and report.
+    """
+
+    objective = make_objective(bench, scenario, fidelity_space, metric, runtime_metric=RUNTIME_METRICS[scenario])
+    history, report = simulate(optimiser, objective, budget, fidelity_space.min_budget, n_workers)
+
+    print(f"Total Runs: {len(history)}")
+    print(f"Simulated Time: {report.makespan:0.2f} s on {n_workers} workers")
+    print(f"Utilisation: {report.utilisation:0.3f}, Barrier Idle: {report.barrier_idle_time:0.2f} s")
+
+    # Save results and simulation report to pickle files
+    name = type(optimiser).__name__
+    suffix = f"{suffix}_{n_workers}workers"
+    save_history(history, name, scenario, instance, fidelity_space, budget, metric, seed, suffix)
+    save_early_stopping(optimiser, scenario, instance, budget, seed, suffix)
     with open(
-        (parent_path / f"results/pkl/{seed}/{optimiser_class.__name__}_{scenario}_{instance}_{total_budget}.pkl").resolve(), "wb"
+        (parent_path / f"results/pkl/{seed}/{name}_{scenario}_{instance}_{budget}{suffix}_report.pkl").resolve(), "wb"
     ) as f:
-        pickle.dump(runs, f)
+        pickle.dump({**asdict(report), "utilisation": report.utilisation}, f)
+
+    # Count the configurations evaluated at the initial budget
+    count = 0
+    if len(history.budget_levels) > 1:
+        count = sum(t.budget == history.budget_levels[1] for t in history.trials)
 
-    return best_config, best_result, count
+    best = history.best
+    if best is None:
+        return {}, 0, count
+    return history.configs[best.config_id], best.result, count
 
 if __name__ == "__main__":
     total_budget = 10000
@@ -110,7 +267,7 @@ if __name__ == "__main__":
     for seed in seeds:
         for scenario, instance, fidelity_param, metric in [
             ("nb301", "cifar10", "epoch", "val_accuracy"),
-            ("rbv2_xgboost", "16", "trainsize", "acc"),
+            ("rbv2_xgboost", "16", ("trainsize", "repl"), "acc"),
         ]:
             for optimiser_class in [
                 RandomSearch,
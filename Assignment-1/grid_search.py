@@ -1,5 +1,5 @@
 from ConfigSpace import ConfigurationSpace
-from hpo_algorithm import HPOAlgorithm
+from hpo_algorithm import FidelitySpace, HPOAlgorithm
 
 
 class GridSearch(HPOAlgorithm):
@@ -17,6 +17,7 @@ class GridSearch(HPOAlgorithm):
         min_budget: int,
         max_budget: int,
         seed: int = None,
+        fidelity_space: FidelitySpace = None,
     ) -> None:
         """
         Initialises the GridSearch optimizer class.
@@ -27,9 +28,11 @@ class GridSearch(HPOAlgorithm):
             min_budget (int): Minimum budget per evaluation.
             max_budget (int): Maximum budget per evaluation.
             seed (int, optional): Random seed for reproducibility. Defaults to None.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
         """
 
-        super().__init__(cs, total_budget, min_budget, max_budget, seed)
+        super().__init__(cs, total_budget, min_budget, max_budget, seed, fidelity_space)
         
         # Calculate total no. of configs to evaluate
         ratio = max_budget / min_budget
@@ -57,7 +60,7 @@ class GridSearch(HPOAlgorithm):
         
         # Return next config and budget for evaluation
         self.idx += 1
-        return (self.configs[self.idx - 1], self.max_budget)
+        return (self.configs[self.idx - 1].copy(), self.max_budget)
     
     def tell(self, result: float) -> None:
         """
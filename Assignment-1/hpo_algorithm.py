@@ -15,6 +15,84 @@ from ConfigSpace.conditions import (
 )
 
 import numpy as np
+from scipy.stats import qmc
+
+
+class FidelitySpace:
+    """
+    Maps a scalar budget onto one or more fidelity parameters.
+
+    The first fidelity parameter is the primary one and takes the budget
+    scheduled by the optimiser. All other fidelity parameters are scaled
+    together with it, geometrically from their lower to their upper bound,
+    so that the minimum budget is the cheapest and the maximum budget the
+    full evaluation on every dimension.
+    """
+
+    def __init__(self, params: list) -> None:
+        """
+        Initialises the fidelity space.
+
+        Args:
+            params (list): Fidelity hyperparameters with lower and upper bounds,
+                           the primary one first.
+        """
+
+        self.params: list = list(params)
+        self.names: list[str] = [param.name for param in self.params]
+        self.min_budget: float = self.params[0].lower
+        self.max_budget: float = self.params[0].upper
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def values(self, budget: float) -> dict:
+        """
+        Returns the value of every fidelity parameter for a budget.
+
+        Args:
+            budget (float): Budget of the primary fidelity parameter.
+
+        Returns:
+            dict: Fidelity parameter names and values.
+        """
+
+        # Position of the budget on a geometric scale between min and max
+        if self.max_budget == self.min_budget:
+            t = 1.0
+        else:
+            t = np.log(budget / self.min_budget) / np.log(self.max_budget / self.min_budget)
+
+        values = {self.names[0]: budget}
+        for param in self.params[1:]:
+            value = param.lower * (param.upper / param.lower) ** t
+            if isinstance(param, UniformIntegerHyperparameter):
+                value = int(round(value))
+            values[param.name] = min(max(value, param.lower), param.upper)
+        return values
+
+    def cost(self, budget: float) -> float:
+        """
+        Returns the cost of an evaluation in units of the minimum budget.
+
+        The cost is the fraction of a full evaluation across all fidelity
+        dimensions, scaled so that a full evaluation costs
+        max_budget / min_budget as with a single fidelity parameter.
+
+        Args:
+            budget (float): Budget of the primary fidelity parameter.
+
+        Returns:
+            float: The cost of the evaluation.
+        """
+
+        if budget == 0:
+            return 0.0
+
+        fraction = 1.0
+        for param, value in zip(self.params, self.values(budget).values()):
+            fraction *= value / param.upper
+        return fraction * self.max_budget / self.min_budget
 
 
 class HPOAlgorithm:
@@ -28,6 +106,7 @@ class HPOAlgorithm:
         min_budget: int,
         max_budget: int,
         seed: int = None,
+        fidelity_space: FidelitySpace = None,
     ) -> None:
         """
         Initialises the base HPO algorithm.
@@ -38,6 +117,8 @@ class HPOAlgorithm:
             min_budget (int): Minimum budget per evaluation.
             max_budget (int): Maximum budget per evaluation.
             seed (int, optional): Random seed for reproducibility. Defaults to None.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
         """
 
         self.cs: ConfigurationSpace = cs
@@ -45,6 +126,7 @@ class HPOAlgorithm:
         self.min_budget: int = min_budget
         self.max_budget: int = max_budget
         self.seed: int = seed
+        self.fidelity_space: FidelitySpace = fidelity_space
 
         # Preprocess conditions for faster checking later
         conditions = {}
@@ -52,6 +134,11 @@ class HPOAlgorithm:
             conditions.setdefault(condition.child.name, []).append(condition)
         self.conditions: dict = conditions
 
+        # Proposed configurations, their results and the next config to propose
+        self.configs: list[dict] = []
+        self.evals: list[float] = []
+        self.idx: int = 0
+
     @abstractmethod
     def ask(self) -> tuple[dict, float]:
         """
@@ -75,6 +162,36 @@ class HPOAlgorithm:
 
         pass
     
+    def cost(self, budget: float) -> float:
+        """
+        Returns the cost of an evaluation in units of the minimum budget.
+
+        Args:
+            budget (float): The budget of the evaluation.
+
+        Returns:
+            float: The cost of the evaluation.
+        """
+
+        if self.fidelity_space is not None:
+            return self.fidelity_space.cost(budget)
+        return budget / self.min_budget
+
+    def is_ready(self) -> bool:
+        """
+        Checks whether ask() can be called before all pending results are told.
+
+        Results must still be told in the order the configurations were
+        proposed. Optimisers that only propose new configurations once all
+        results are known (e.g. at the end of a Successive Halving rung or a
+        Bayesian Optimisation step) are not ready while results are pending.
+
+        Returns:
+            bool: True if ask() can propose the next configuration, else False.
+        """
+
+        return self.idx < len(self.configs) or len(self.evals) == len(self.configs)
+
     def is_satisfied(self, hp_name: str, config: dict) -> bool:
         """
         Checks whether all conditional constraints for a hyperparameter are satisfied.
@@ -145,12 +262,13 @@ class HPOAlgorithm:
         
         return values
 
-    def sample(self, size: int = 1) -> list[dict] | dict:
+    def sample(self, size: int = 1, seed: int = None) -> list[dict] | dict:
         """
         Randomly samples valid configurations from the configuration space.
 
         Args:
             size (int, optional): Number of configurations to sample. Defaults to 1.
+            seed (int, optional): Random seed of the sample. Defaults to the optimiser's seed.
 
         Returns:
             dict or list[dict]: A single sampled configuration or a list of sampled configurations.
@@ -159,7 +277,7 @@ class HPOAlgorithm:
             ValueError: If valid configurations cannot be sampled after many attempts.
         """
 
-        rng = np.random.default_rng(seed=self.seed)
+        rng = np.random.default_rng(seed=self.seed if seed is None else seed)
         hp_names = self.cs.get_hyperparameter_names()
         iteration = 0
         missing = size
@@ -232,6 +350,198 @@ class HPOAlgorithm:
         else:
             return accepted_configurations
     
+    def _topological_order(self) -> list[str]:
+        """
+        Orders the hyperparameter names so that parents precede their children.
+
+        Returns:
+            list[str]: The ordered hyperparameter names.
+        """
+
+        remaining = list(self.cs.get_hyperparameter_names())
+        order = []
+        placed = set()
+        while remaining:
+            progress = False
+            for hp_name in list(remaining):
+                parents = {condition.parent.name for condition in self.conditions.get(hp_name, [])}
+                if parents <= placed:
+                    order.append(hp_name)
+                    placed.add(hp_name)
+                    remaining.remove(hp_name)
+                    progress = True
+            
+            # Keep the original order for anything left (e.g. cyclic conditions)
+            if not progress:
+                order.extend(remaining)
+                break
+        
+        return order
+
+    def _from_unit(self, hp_name: str, u: np.ndarray) -> np.ndarray:
+        """
+        Maps points from the unit interval to values of a hyperparameter.
+
+        Args:
+            hp_name (str): The name of the hyperparameter.
+            u (np.ndarray): Points in [0, 1).
+
+        Returns:
+            np.ndarray: The corresponding hyperparameter values.
+        """
+
+        param = self.cs[hp_name]
+        if isinstance(param, (CategoricalHyperparameter)):
+            choices = np.array(param.choices, dtype=object)
+            return choices[np.minimum((u * len(choices)).astype(int), len(choices) - 1)]
+        
+        elif isinstance(param, (OrdinalHyperparameter)):
+            sequence = np.array(param.sequence, dtype=object)
+            return sequence[np.minimum((u * len(sequence)).astype(int), len(sequence) - 1)]
+        
+        elif isinstance(param, Constant):
+            return np.full(len(u), param.value, dtype=object)
+        
+        elif isinstance(param, UniformFloatHyperparameter):
+            if param.log:
+                lower, upper = np.log([param.lower, param.upper])
+                return np.exp(lower + u * (upper - lower))
+            return param.lower + u * (param.upper - param.lower)
+        
+        elif isinstance(param, UniformIntegerHyperparameter):
+            if param.log:
+                lower, upper = np.log([param.lower, param.upper])
+                values = np.round(np.exp(lower + u * (upper - lower)))
+            else:
+                values = param.lower + np.floor(u * (param.upper - param.lower + 1))
+            return np.clip(values, param.lower, param.upper).astype(int)
+        
+        raise TypeError(f"Unknown hyperparameter type {type(param)}")
+
+    def _to_unit(self, hp_name: str, value) -> float:
+        """
+        Maps a hyperparameter value to the unit interval.
+
+        This is the inverse of _from_unit(), mapping categorical and integer
+        values to the centre of their bin.
+
+        Args:
+            hp_name (str): The name of the hyperparameter.
+            value: The hyperparameter value.
+
+        Returns:
+            float: The corresponding point in [0, 1].
+        """
+
+        param = self.cs[hp_name]
+        if isinstance(param, (CategoricalHyperparameter)):
+            return (param.choices.index(value) + 0.5) / len(param.choices)
+        
+        elif isinstance(param, (OrdinalHyperparameter)):
+            return (param.sequence.index(value) + 0.5) / len(param.sequence)
+        
+        elif isinstance(param, Constant):
+            return 0.5
+        
+        elif isinstance(param, UniformFloatHyperparameter):
+            if param.log:
+                lower, upper = np.log([param.lower, param.upper])
+                return float((np.log(value) - lower) / (upper - lower))
+            return float((value - param.lower) / (param.upper - param.lower))
+        
+        elif isinstance(param, UniformIntegerHyperparameter):
+            if param.log:
+                lower, upper = np.log([param.lower, param.upper])
+                return float((np.log(value) - lower) / (upper - lower))
+            return float((value - param.lower + 0.5) / (param.upper - param.lower + 1))
+        
+        raise TypeError(f"Unknown hyperparameter type {type(param)}")
+
+    def design(self, size: int, method: str = "sobol", seed: int = None) -> list[dict]:
+        """
+        Generates an initial design of valid configurations.
+
+        Quasi-random points are drawn in bulk in the unit hypercube, one
+        dimension per hyperparameter, and mapped through the log, integer and
+        categorical transforms of the space. Hyperparameters whose conditions
+        are not satisfied are left out, and duplicates are dropped.
+
+        Args:
+            size (int): Number of configurations to generate.
+            method (str, optional): One of "sobol" (scrambled Sobol sequence),
+                                    "lhs" (Latin hypercube) or "random" (sample()).
+                                    Defaults to "sobol".
+            seed (int, optional): Random seed of the design. Defaults to the optimiser's seed.
+
+        Returns:
+            list[dict]: The generated configurations.
+        
+        Raises:
+            ValueError: If the method is unknown or valid configurations cannot be generated.
+        """
+
+        if seed is None:
+            seed = self.seed
+
+        if method == "random":
+            configs = self.sample(size, seed)
+            return [configs] if size == 1 else configs
+
+        rng = np.random.default_rng(seed=seed)
+        hp_names = self._topological_order()
+        if method == "sobol":
+            sampler = qmc.Sobol(d=len(hp_names), scramble=True, seed=rng)
+        elif method == "lhs":
+            sampler = qmc.LatinHypercube(d=len(hp_names), seed=rng)
+        else:
+            raise ValueError(f"Unknown design method {method}")
+
+        accepted_configurations = []
+        seen = set()
+        iteration = 0
+        
+        while len(accepted_configurations) < size:
+            missing = size - len(accepted_configurations)
+            if method == "sobol":
+                # Draw a power of two to keep the balance properties of the sequence
+                points = sampler.random_base2(int(np.ceil(np.log2(max(missing, 2)))))
+            else:
+                points = sampler.random(missing)
+
+            # Map each dimension to its hyperparameter in bulk
+            columns = [self._from_unit(hp_name, points[:, j]) for j, hp_name in enumerate(hp_names)]
+            
+            for i in range(len(points)):
+                config = {}
+                for hp_name, values in zip(hp_names, columns):
+                    if self.is_satisfied(hp_name, config):
+                        config[hp_name] = values[i].item() if isinstance(values[i], np.generic) else values[i]
+                
+                # Try to validate and store configuration dictionary
+                key = tuple(sorted(config.items()))
+                try:
+                    _ = Configuration(self.cs, config)
+                    if key in seen:
+                        raise ValueError("Duplicate configuration")
+                    seen.add(key)
+                    accepted_configurations.append(config)
+                    if len(accepted_configurations) == size:
+                        break
+                
+                except ValueError:
+                    iteration += 1
+                    
+                    if iteration == size * 100:
+                        raise ValueError(
+                            "Cannot sample valid configuration for "
+                            "%s" % self.cs)
+            
+            # Top up with a freshly scrambled sequence if points were rejected
+            if method == "sobol":
+                sampler = qmc.Sobol(d=len(hp_names), scramble=True, seed=rng)
+        
+        return accepted_configurations
+
     def grid(self, n_init: int, num_steps: int = 5) -> list[dict]:
         """
         Generates a grid of configurations based on discretized parameter values.
@@ -1,5 +1,5 @@
 from ConfigSpace import ConfigurationSpace
-from hpo_algorithm import HPOAlgorithm
+from hpo_algorithm import FidelitySpace, HPOAlgorithm
 
 
 class RandomSearch(HPOAlgorithm):
@@ -16,6 +16,8 @@ class RandomSearch(HPOAlgorithm):
         min_budget: int,
         max_budget: int,
         seed: int = None,
+        fidelity_space: FidelitySpace = None,
+        init_design: str = "random",
     ) -> None:
         """
         Initialises the RandomSearch optimizer class.
@@ -26,16 +28,20 @@ class RandomSearch(HPOAlgorithm):
             min_budget (int): Minimum budget per evaluation.
             max_budget (int): Maximum budget per evaluation.
             seed (int, optional): Random seed for reproducibility. Defaults to None.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
+            init_design (str, optional): Initial design, one of "random", "sobol" or "lhs".
+                                         Defaults to "random".
         """
 
-        super().__init__(cs, total_budget, min_budget, max_budget, seed)
+        super().__init__(cs, total_budget, min_budget, max_budget, seed, fidelity_space)
         
         # Calculate total no. of configs to evaluate
         ratio = max_budget / min_budget
         n_init = int(total_budget  / ratio)
         
-        # Randomly sample n_init configurations from the configspace
-        self.configs = self.sample(n_init)
+        # Generate n_init configurations from the configspace
+        self.configs = self.design(n_init, init_design)
         self.evals = []
         self.idx = 0
     
@@ -55,7 +61,7 @@ class RandomSearch(HPOAlgorithm):
         
         # Return next config and budget for evaluation
         self.idx += 1
-        return (self.configs[self.idx - 1], self.max_budget)
+        return (self.configs[self.idx - 1].copy(), self.max_budget)
     
     def tell(self, result: float) -> None:
         """
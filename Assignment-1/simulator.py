@@ -0,0 +1,118 @@
+from dataclasses import dataclass, field
+from hpo_algorithm import HPOAlgorithm
+from trial import TrialHistory, TrialScheduler
+import heapq
+
+
+@dataclass
+class SimulationReport:
+    """
+    Summary of a simulated parallel run.
+
+    Attributes:
+        n_workers (int): Number of virtual workers.
+        makespan (float): Simulated wall-clock time of the run.
+        busy_time (float): Total time workers spent evaluating.
+        idle_time (float): Total time workers spent idle before the run finished.
+        barrier_idle_time (float): Part of idle_time spent waiting for pending
+                                   results before the optimiser could propose
+                                   further trials.
+        anytime (list[tuple[float, float]]): Simulated time and best result
+                                             whenever the incumbent improved.
+    """
+
+    n_workers: int
+    makespan: float = 0.0
+    busy_time: float = 0.0
+    idle_time: float = 0.0
+    barrier_idle_time: float = 0.0
+    anytime: list[tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def utilisation(self) -> float:
+        """
+        Fraction of the available worker time spent evaluating.
+        """
+
+        if self.makespan == 0:
+            return 0.0
+        return self.busy_time / (self.n_workers * self.makespan)
+
+
+def simulate(
+    optimiser: HPOAlgorithm,
+    objective,
+    budget: float,
+    min_budget: float,
+    n_workers: int,
+) -> tuple[TrialHistory, SimulationReport]:
+    """
+    Simulates running an optimiser on N parallel workers.
+
+    Each evaluation occupies a virtual worker for the runtime returned by the
+    objective (e.g. predicted by the YAHPO surrogate), and a virtual clock is
+    advanced from one finishing evaluation to the next. Evaluations at a
+    higher rung are assumed to continue from the previous rung, matching the
+    budget accounting, so only the matching fraction of the runtime is spent.
+
+    Args:
+        optimiser (HPOAlgorithm): The optimiser proposing configurations.
+        objective (callable): Function mapping a configuration and budget to a
+                              (result, runtime) tuple.
+        budget (float): Total evaluation budget.
+        min_budget (float): Minimum budget per evaluation, used as the cost unit.
+        n_workers (int): Number of virtual workers.
+
+    Returns:
+        tuple[TrialHistory, SimulationReport]: The trials told to the optimiser
+                                               and the simulation summary.
+    """
+
+    scheduler = TrialScheduler(optimiser, budget, min_budget)
+    report = SimulationReport(n_workers=n_workers)
+    events = [] # (finish time, trial key, result)
+    clock = 0.0
+    best_result = None
+    waiting_time = 0.0 # idle time that turns out to be a barrier if more trials follow
+
+    while True:
+        # Hand out trials to free workers while the optimiser and budget allow it
+        while len(events) < n_workers and scheduler.can_propose():
+            trial = scheduler.propose()
+            if trial is None:
+                break
+
+            report.barrier_idle_time += waiting_time
+            waiting_time = 0.0
+
+            key, config, _budget, cost = trial
+            result, runtime = objective(config, _budget)
+            runtime *= cost / optimiser.cost(_budget)
+
+            heapq.heappush(events, (clock + runtime, key, result))
+            report.busy_time += runtime
+
+        if not events:
+            break
+
+        # Free workers may be blocked on a synchronisation barrier if the
+        # optimiser could still propose trials
+        blocked = scheduler.has_budget and not optimiser.is_ready()
+
+        # Advance the clock to the next finishing evaluation
+        finish_time, finished_key, result = heapq.heappop(events)
+        idle = (n_workers - len(events) - 1) * (finish_time - clock)
+        report.idle_time += idle
+        if blocked:
+            waiting_time += idle
+        clock = finish_time
+
+        if best_result is None or result > best_result:
+            best_result = result
+            report.anytime.append((clock, result))
+
+        # Tell results in the order they were proposed
+        scheduler.complete(finished_key, result)
+
+    report.makespan = clock
+    return scheduler.history, report
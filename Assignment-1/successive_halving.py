@@ -1,5 +1,6 @@
 from ConfigSpace import ConfigurationSpace
-from hpo_algorithm import HPOAlgorithm
+from early_stopping import LearningCurveStopper
+from hpo_algorithm import FidelitySpace, HPOAlgorithm
 import numpy as np
 
 
@@ -20,6 +21,9 @@ class SuccessiveHalving(HPOAlgorithm):
         max_budget: int,
         seed: int = None,
         eta: int = 2,
+        fidelity_space: FidelitySpace = None,
+        early_stopping: bool = False,
+        metric_bounds: tuple[float, float] = None,
     ) -> None:
         """
         Initialises the SuccessiveHalving optimizer class.
@@ -31,9 +35,15 @@ class SuccessiveHalving(HPOAlgorithm):
             max_budget (int): Maximum budget per evaluation.
             seed (int, optional): Random seed for reproducibility. Defaults to None.
             eta (int, optional): Halving rate. Defaults to 2.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
+            early_stopping (bool, optional): Drop promoted configs whose extrapolated learning
+                                             curve is confidently below the best one. Defaults to False.
+            metric_bounds (tuple[float, float], optional): Range of the metric that extrapolated
+                                                           curves are clipped to. Defaults to no bounds.
         """
 
-        super().__init__(cs, total_budget, min_budget, max_budget, seed)
+        super().__init__(cs, total_budget, min_budget, max_budget, seed, fidelity_space)
         
         self.eta = eta
 
@@ -45,12 +55,63 @@ class SuccessiveHalving(HPOAlgorithm):
         # n_init = int(self.eta ** n_rounds)
         n_init = int(total_budget * (n_rounds / self.eta + ratio / self.eta**n_rounds)**-1)
 
+        if self.fidelity_space is not None and len(self.fidelity_space) > 1:
+            # Rounds are cheaper when all fidelities scale together, so pick the
+            # largest n_init whose full halving schedule fits in the budget
+            upper = max(n_init, 1)
+            while self._schedule_cost(upper) <= total_budget:
+                upper *= 2
+            lower = 0
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if self._schedule_cost(middle) <= total_budget:
+                    lower = middle
+                else:
+                    upper = middle
+            n_init = max(lower, 1)
+
         # Randomly sample n_init configurations from the configspace
         self.configs = self.sample(n_init)
         self.evals = []
         self.idx = 0
         self.curr_budget = min_budget # initial budget
+
+        # Partial learning curve of each config across rounds
+        self.curves = [[] for _ in self.configs]
+        self.stopper = LearningCurveStopper(max_budget, bounds=metric_bounds) if early_stopping else None
+        self.n_stopped = 0 # configs dropped by early stopping
+        self.saved_budget = 0.0 # budget they would have used in the round they were dropped before
     
+    def _schedule_cost(self, n_init: int) -> float:
+        """
+        Computes the total cost of the halving schedule started with n_init configs.
+
+        Replays the rounds of ask(), including the final round at max_budget
+        and the jump to max_budget once a single config is left. Each round is
+        charged the cost of continuing its configs from the previous round.
+
+        Args:
+            n_init (int): Number of configs in the first round.
+
+        Returns:
+            float: The total cost in units of the minimum budget.
+        """
+
+        n_configs = n_init
+        budget = self.min_budget
+        prev_cost = 0.0
+        total = 0.0
+        while n_configs > 0:
+            curr_cost = self.cost(budget)
+            total += n_configs * (curr_cost - prev_cost)
+            if budget == self.max_budget:
+                break
+
+            n_configs //= self.eta
+            budget = self.max_budget if n_configs == 1 else min(budget * self.eta, self.max_budget)
+            prev_cost = curr_cost
+        return total
+
     def ask(self) -> tuple[dict, float]:
         """
         Proposes the next hyperparameter configuration and budget to evaluate.
@@ -66,6 +127,8 @@ class SuccessiveHalving(HPOAlgorithm):
                 # Final round completed, return None
                 print(f"Iteration {int(np.ceil(np.emath.logn(self.eta, self.max_budget / self.min_budget)) + 1)}:")
                 print(f"Configs: {len(self.configs)}, Budget: {self.max_budget}")
+                if self.stopper is not None:
+                    print(f"Budget Saved: {self.saved_budget:0.2f}")
                 return (None, self.max_budget)
             
             # Print current iteration info
@@ -75,11 +138,23 @@ class SuccessiveHalving(HPOAlgorithm):
             # Select top-performing configs to move to next round
             top_evals = np.argsort(self.evals)[::-1][: len(self.evals) // self.eta]
             self.configs = [self.configs[i] for i in top_evals]
+            self.curves = [self.curves[i] for i in top_evals]
 
             # Reset evaluation list and increase the budget
             self.evals = []
+            prev_budget = self.curr_budget
             self.curr_budget *= self.eta
             self.curr_budget = min(self.curr_budget, self.max_budget)
+
+            # Drop configs that are not expected to catch up before the next round
+            if self.stopper is not None:
+                keep = self.stopper.keep(self.curves)
+                n_dropped = len(self.configs) - len(keep)
+                self.configs = [self.configs[i] for i in keep]
+                self.curves = [self.curves[i] for i in keep]
+                self.n_stopped += n_dropped
+                self.saved_budget += n_dropped * (self.cost(self.curr_budget) - self.cost(prev_budget))
+                print(f"Configs stopped early: {n_dropped}")
             print(f"Configs left: {len(self.configs)}")
 
             # If only one config remains, evaluate it for max budget
@@ -90,7 +165,7 @@ class SuccessiveHalving(HPOAlgorithm):
         
         # Return next config and budget for evaluation
         self.idx += 1
-        return (self.configs[self.idx - 1], self.curr_budget)
+        return (self.configs[self.idx - 1].copy(), self.curr_budget)
 
     def tell(self, result: float) -> None:
         """
@@ -101,3 +176,4 @@ class SuccessiveHalving(HPOAlgorithm):
         """
 
         self.evals.append(result)
+        self.curves[len(self.evals) - 1].append((self.curr_budget, result))
@@ -0,0 +1,388 @@
+from collections import deque
+from dataclasses import dataclass, fields
+from hpo_algorithm import HPOAlgorithm
+import itertools
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class Trial:
+    """
+    Immutable record of a single evaluation.
+
+    The configuration itself is not stored on the trial, only a reference to
+    it in the owning TrialHistory, so repeated evaluations of the same
+    configuration (e.g. across Successive Halving rungs) share one dict.
+
+    Attributes:
+        config_id (int): Index of the configuration in TrialHistory.configs.
+        budget (float): Fidelity value the configuration was evaluated at.
+        start_time (float): Budget used before the evaluation started.
+        end_time (float): Budget used after the evaluation finished.
+        result (float): Observed value of the target metric.
+    """
+
+    config_id: int
+    budget: float
+    start_time: float
+    end_time: float
+    result: float
+
+
+# Structured dtype mirroring the Trial fields, used for bulk history
+TRIAL_DTYPE = np.dtype([
+    ("config_id", np.int64),
+    ("budget", np.float64),
+    ("start_time", np.float64),
+    ("end_time", np.float64),
+    ("result", np.float64),
+])
+
+
+class TrialHistory:
+    """
+    Stores the evaluated configurations and trials of an optimisation run.
+
+    Configurations are stored once and referenced by integer id from the
+    trials. The history also tracks the budget used, following the budget
+    accounting of the runner.
+    """
+
+    def __init__(self, min_budget: float, cost_fn=None) -> None:
+        """
+        Initialises an empty trial history.
+
+        Args:
+            min_budget (float): Minimum budget per evaluation, used as the cost unit.
+            cost_fn (callable, optional): Function mapping a budget to its cost, e.g.
+                                          HPOAlgorithm.cost. Defaults to budget / min_budget.
+        """
+
+        self.min_budget: float = min_budget
+        self.cost_fn = cost_fn or (lambda budget: budget / min_budget)
+        self.configs: list[dict] = []
+        self.trials: list[Trial] = []
+        self.budget_levels: list[float] = [0]
+        self.used_budget: float = 0.0
+
+        self._config_ids: dict[tuple, int] = {}
+        self._best: Trial = None
+
+    def __len__(self) -> int:
+        return len(self.trials)
+
+    def config_id(self, config: dict) -> int:
+        """
+        Returns the id of a configuration, registering it if it is new.
+
+        Args:
+            config (dict): The hyperparameter configuration.
+
+        Returns:
+            int: Index of the configuration in self.configs.
+        """
+
+        key = tuple(sorted(config.items()))
+        config_id = self._config_ids.get(key)
+        if config_id is None:
+            config_id = len(self.configs)
+            self._config_ids[key] = config_id
+            self.configs.append(dict(config))
+        return config_id
+
+    def register_budget(self, budget: float) -> None:
+        """
+        Registers a budget level proposed by the optimiser.
+
+        Args:
+            budget (float): The proposed budget.
+        """
+
+        if budget not in self.budget_levels:
+            self.budget_levels.append(budget)
+
+    def cost(self) -> float:
+        """
+        Returns the cost of an evaluation at the current budget level.
+
+        Evaluations at a higher rung are assumed to continue from the previous
+        rung, so only the budget difference is charged.
+
+        Returns:
+            float: Cost in units of the minimum budget.
+        """
+
+        return self.cost_fn(self.budget_levels[-1]) - self.cost_fn(self.budget_levels[-2])
+
+    def record(self, config: dict, budget: float, result: float, cost: float = None) -> Trial:
+        """
+        Charges the cost of an evaluation and stores it as a trial.
+
+        Args:
+            config (dict): The evaluated configuration, without fidelity parameters.
+            budget (float): The budget the configuration was evaluated at.
+            result (float): The observed metric value.
+            cost (float, optional): Cost of the evaluation. Defaults to self.cost().
+
+        Returns:
+            Trial: The stored trial.
+        """
+
+        if cost is None:
+            cost = self.cost()
+
+        start_time = self.used_budget
+        self.used_budget += cost
+        trial = Trial(self.config_id(config), budget, start_time, self.used_budget, result)
+        self.trials.append(trial)
+
+        if self._best is None or result > self._best.result:
+            self._best = trial
+        return trial
+
+    @property
+    def best(self) -> Trial:
+        """
+        Trial with the best observed result, or None if no trial was recorded.
+        """
+
+        return self._best
+
+    def to_records(self) -> np.ndarray:
+        """
+        Converts the trials into a structured NumPy array.
+
+        Returns:
+            np.ndarray: Array of dtype TRIAL_DTYPE with one row per trial.
+        """
+
+        names = [f.name for f in fields(Trial)]
+        return np.array(
+            [tuple(getattr(t, name) for name in names) for t in self.trials],
+            dtype=TRIAL_DTYPE,
+        )
+
+    def to_rows(self, fidelity_space, metric: str) -> list[dict]:
+        """
+        Expands the trials into flat dictionaries, one per trial.
+
+        This is the format of the pickled run results consumed by DeepCAVE
+        and results.ipynb.
+
+        Args:
+            fidelity_space (FidelitySpace): Fidelity parameters the budget is stored as.
+            metric (str): Name under which the result is stored.
+
+        Returns:
+            list[dict]: One dictionary per trial.
+        """
+
+        return [
+            {
+                **self.configs[t.config_id],
+                **fidelity_space.values(t.budget),
+                "start_time": t.start_time,
+                "end_time": t.end_time,
+                metric: t.result,
+            }
+            for t in self.trials
+        ]
+
+
+class PendingTrials:
+    """
+    Tracks configurations that were proposed but not yet told to the optimiser.
+
+    Optimisers expect results in the order the configurations were proposed,
+    while parallel evaluations may finish in any order. Completed results are
+    held back until all earlier trials have completed as well.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialises an empty set of pending trials.
+        """
+
+        self._order: deque = deque()
+        self._trials: dict = {}
+        self._results: dict = {}
+        self.reserved_budget: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._trials)
+
+    def __contains__(self, key) -> bool:
+        return key in self._trials
+
+    def add(self, key, config: dict, budget: float, cost: float) -> None:
+        """
+        Adds a proposed configuration and reserves its cost.
+
+        Args:
+            key: Unique identifier of the trial.
+            config (dict): The proposed configuration.
+            budget (float): The proposed budget.
+            cost (float): Cost charged for the evaluation.
+        """
+
+        self._order.append(key)
+        self._trials[key] = (config, budget, cost)
+        self.reserved_budget += cost
+
+    def complete(self, key, result: float) -> None:
+        """
+        Stores the result of a pending trial.
+
+        Args:
+            key: Identifier of the trial.
+            result (float): The observed metric value.
+        """
+
+        if key in self._trials:
+            self._results[key] = result
+
+    def pop_ready(self) -> list[tuple[dict, float, float, float]]:
+        """
+        Removes and returns completed trials that can be told in order.
+
+        Returns:
+            list[tuple]: (config, budget, cost, result) for each trial, in
+                         the order the configurations were proposed.
+        """
+
+        ready = []
+        while self._order and self._order[0] in self._results:
+            key = self._order.popleft()
+            config, budget, cost = self._trials.pop(key)
+            self.reserved_budget -= cost
+            ready.append((config, budget, cost, self._results.pop(key)))
+        return ready
+
+
+class TrialScheduler:
+    """
+    Proposes trials for parallel evaluation and tells their results in order.
+
+    The cost of a trial is reserved when it is proposed, so no more trials
+    are proposed than the remaining budget allows. Results are told to the
+    optimiser and recorded once all earlier proposals have completed, and
+    each trial is charged like in the synchronous runner in experiment.py.
+    """
+
+    def __init__(self, optimiser: HPOAlgorithm, budget: float, min_budget: float) -> None:
+        """
+        Initialises the scheduler.
+
+        Args:
+            optimiser (HPOAlgorithm): The optimiser proposing configurations.
+            budget (float): Total evaluation budget.
+            min_budget (float): Minimum budget per evaluation, used as the cost unit.
+        """
+
+        self.optimiser: HPOAlgorithm = optimiser
+        self.budget: float = budget
+        self.history: TrialHistory = TrialHistory(min_budget=min_budget, cost_fn=optimiser.cost)
+        self.pending: PendingTrials = PendingTrials()
+        self.exhausted: bool = False # the optimiser has no configurations left
+        self._keys = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    @property
+    def has_budget(self) -> bool:
+        """
+        Whether the optimiser is not exhausted and budget is left after the pending trials.
+        """
+
+        return not self.exhausted and self.history.used_budget + self.pending.reserved_budget < self.budget
+
+    def can_propose(self) -> bool:
+        """
+        Whether a trial can be proposed without waiting for pending results.
+        """
+
+        return self.has_budget and self.optimiser.is_ready()
+
+    def propose(self) -> tuple[int, dict, float, float] | None:
+        """
+        Asks the optimiser for the next trial and reserves its cost.
+
+        Returns:
+            tuple[int, dict, float, float] or None: Key, configuration, budget and cost
+                                                    of the trial, or None if the optimiser
+                                                    is exhausted.
+        """
+
+        config, budget = self.optimiser.ask()
+        self.history.register_budget(budget)
+        if config is None:
+            self.exhausted = True
+            return None
+
+        key = next(self._keys)
+        cost = self.history.cost()
+        self.pending.add(key, config, budget, cost)
+        return key, config, budget, cost
+
+    def complete(self, key: int, result: float) -> list[Trial]:
+        """
+        Stores the result of a trial and tells all results that are ready.
+
+        Args:
+            key (int): Key of the trial returned by propose().
+            result (float): The observed metric value.
+
+        Returns:
+            list[Trial]: The trials told to the optimiser, in proposal order.
+        """
+
+        self.pending.complete(key, result)
+        told = []
+        for config, budget, cost, _result in self.pending.pop_ready():
+            self.optimiser.tell(_result)
+            told.append(self.history.record(config, budget, _result, cost))
+        return told
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether no trials are pending and no further trials will be proposed.
+        """
+
+        return not self.pending and (self.exhausted or self.history.used_budget >= self.budget)
+
+
+if __name__ == "__main__":
+    # Compare memory per trial of the previous dict-based run log with
+    # Trial records and a structured array for a 100k-trial run
+    import tracemalloc
+
+    n_trials = 100_000
+    rng = np.random.default_rng(seed=0)
+    config = {f"hp_{i}": float(v) for i, v in enumerate(rng.uniform(size=10))}
+
+    def _measure(build):
+        tracemalloc.start()
+        log = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size / len(log)
+
+    def _dict_log():
+        return [
+            {**config, "epoch": 1, "start_time": float(i), "end_time": float(i + 1), "acc": float(i)}
+            for i in range(n_trials)
+        ]
+
+    def _trial_log():
+        return [Trial(i % 100, 1.0, float(i), float(i + 1), float(i)) for i in range(n_trials)]
+
+    def _record_log():
+        records = np.zeros(n_trials, dtype=TRIAL_DTYPE)
+        records["result"] = np.arange(n_trials)
+        return records
+
+    for name, build in [("dict", _dict_log), ("Trial", _trial_log), ("records", _record_log)]:
+        print(f"{name}: {_measure(build):.1f} bytes/trial")
@@ -0,0 +1,304 @@
+from ConfigSpace import Configuration, ConfigurationSpace
+from ConfigSpace.hyperparameters import CategoricalHyperparameter, OrdinalHyperparameter
+from bayesian_optimisation import BayesianOptimisation
+from hpo_algorithm import FidelitySpace
+import numpy as np
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import Matern
+
+
+class TrustRegion:
+    """
+    State of a single local trust region.
+    """
+
+    def __init__(self, length: float, generation: int = 0) -> None:
+        """
+        Initialises an empty trust region.
+
+        Args:
+            length (float): Initial side length in the unit hypercube.
+            generation (int, optional): Number of previous restarts. Defaults to 0.
+        """
+
+        self.length: float = length
+        self.generation: int = generation
+        self.indices: list[int] = [] # indices into configs/evals of in-region data
+        self.best: float = None
+        self.center: dict = None
+        self.successes: int = 0
+        self.failures: int = 0
+
+
+class TrustRegionBO(BayesianOptimisation):
+    """
+    Implements trust-region Bayesian Optimisation (TuRBO-style).
+
+    Keeps one or more local trust regions around their best configuration.
+    Each region fits its own Gaussian Process only on the data it collected,
+    and proposes candidates by perturbing its centre within the region.
+    Regions expand after repeated successes, shrink after repeated failures
+    and restart from a new initial design once they collapse.
+    """
+
+    def __init__(
+        self,
+        cs: ConfigurationSpace,
+        total_budget: int,
+        min_budget: int,
+        max_budget: int,
+        seed: int = None,
+        fidelity_space: FidelitySpace = None,
+        init_design: str = "random",
+        n_regions: int = 1,
+        n_region_init: int = 5,
+        n_candidates: int = 100,
+        max_region_points: int = 50,
+        length_init: float = 0.8,
+        length_min: float = 0.5**7,
+        length_max: float = 1.6,
+        success_tolerance: int = 3,
+        failure_tolerance: int = None,
+    ) -> None:
+        """
+        Initialises the TrustRegionBO class.
+
+        Args:
+            cs (ConfigurationSpace): The hyperparameter configuration space.
+            total_budget (int): Total evaluation budget.
+            min_budget (int): Minimum budget per evaluation.
+            max_budget (int): Maximum budget per evaluation.
+            seed (int, optional): Random seed for reproducibility. Defaults to None.
+            fidelity_space (FidelitySpace, optional): Fidelity parameters scaled with the
+                                                      budget. Defaults to a single one.
+            init_design (str, optional): Initial design, one of "random", "sobol" or "lhs".
+                                         Defaults to "random".
+            n_regions (int, optional): Number of trust regions. Defaults to 1.
+            n_region_init (int, optional): Configurations of the initial design evaluated when
+                                           a region (re)starts. Defaults to 5.
+            n_candidates (int, optional): Candidates scored per region and step. Defaults to 100.
+            max_region_points (int, optional): Maximum number of points each local GP is
+                                               fitted on. Defaults to 50.
+            length_init (float, optional): Initial region side length. Defaults to 0.8.
+            length_min (float, optional): Side length at which a region restarts. Defaults to 0.5**7.
+            length_max (float, optional): Maximum region side length. Defaults to 1.6.
+            success_tolerance (int, optional): Successes in a row before expanding. Defaults to 3.
+            failure_tolerance (int, optional): Failures in a row before shrinking.
+                                               Defaults to max(4, dimensions // 5).
+        """
+
+        # The regions build their own initial design below
+        super().__init__(cs, total_budget, min_budget, max_budget, seed, fidelity_space, init_design, n_design=0)
+
+        self.rng = np.random.default_rng(seed=seed)
+        self.hp_names: list[str] = self._topological_order()
+        self.n_candidates: int = n_candidates
+        self.max_region_points: int = max_region_points
+        self.n_region_init: int = n_region_init
+        self.init_design: str = init_design
+        self.length_init: float = length_init
+        self.length_min: float = length_min
+        self.length_max: float = length_max
+        self.success_tolerance: int = success_tolerance
+        self.failure_tolerance: int = failure_tolerance or max(4, len(self.hp_names) // 5)
+
+        # Initial design split across the regions
+        self.regions: list[TrustRegion] = [TrustRegion(length_init) for _ in range(n_regions)]
+        self.configs = self.design(n_region_init * n_regions, init_design)
+        self.owners: list[tuple[int, int]] = [(i % n_regions, 0) for i in range(len(self.configs))]
+
+    def _encode(self, configs: list[dict]) -> np.ndarray:
+        """
+        Encodes configurations in the unit hypercube for the local surrogates.
+
+        Args:
+            configs (list[dict]): List of hyperparameter configurations.
+
+        Returns:
+            np.ndarray: 2D array with inactive hyperparameters set to -1.
+        """
+
+        return np.array([
+            [self._to_unit(hp_name, cfg[hp_name]) if hp_name in cfg else -1.0 for hp_name in self.hp_names]
+            for cfg in configs
+        ])
+
+    def _candidates(self, center: dict | None, length: float, size: int) -> list[dict]:
+        """
+        Generates valid candidate configurations inside a trust region.
+
+        A random subset of dimensions of the centre is perturbed. Numeric
+        dimensions move within a window of the region's side length, while
+        categorical dimensions only switch value with a probability that
+        shrinks with the region. Hyperparameters that become active are drawn
+        uniformly.
+
+        Args:
+            center (dict or None): Centre of the region, or None for the whole space.
+            length (float): Side length of the region.
+            size (int): Number of candidates to generate.
+
+        Returns:
+            list[dict]: The generated candidates.
+        """
+
+        d = len(self.hp_names)
+        u = self.rng.random((size, d))
+        if center is None:
+            mask = np.ones((size, d), dtype=bool)
+        else:
+            # Perturb about 20 dimensions per candidate, and at least one
+            mask = self.rng.random((size, d)) < min(1.0, 20 / d)
+            mask[np.arange(size), self.rng.integers(0, d, size)] = True
+            step = self.rng.random((size, d)) - 0.5
+
+        candidates = []
+        for i in range(size):
+            config = {}
+            for j, hp_name in enumerate(self.hp_names):
+                if not self.is_satisfied(hp_name, config):
+                    continue
+
+                if center is None or hp_name not in center:
+                    value = u[i, j]
+                elif not mask[i, j]:
+                    config[hp_name] = center[hp_name]
+                    continue
+                elif isinstance(self.cs[hp_name], (CategoricalHyperparameter, OrdinalHyperparameter)):
+                    if u[i, j] > length / self.length_max:
+                        config[hp_name] = center[hp_name]
+                        continue
+                    value = self.rng.random()
+                else:
+                    value = np.clip(self._to_unit(hp_name, center[hp_name]) + step[i, j] * length, 0, 1 - 1e-12)
+
+                value = self._from_unit(hp_name, np.array([value]))[0]
+                config[hp_name] = value.item() if isinstance(value, np.generic) else value
+
+            # Try to validate and store configuration dictionary
+            try:
+                _ = Configuration(self.cs, config)
+                candidates.append(config)
+            except ValueError:
+                continue
+
+        return candidates
+
+    def _restart(self, r: int) -> None:
+        """
+        Restarts a collapsed region from a new initial design.
+
+        Args:
+            r (int): Index of the region.
+        """
+
+        generation = self.regions[r].generation + 1
+        self.regions[r] = TrustRegion(self.length_init, generation)
+        # Draw a fresh design, as the optimiser's seed would repeat the initial one
+        configs = self.design(self.n_region_init, self.init_design, seed=int(self.rng.integers(2**31)))
+        self.configs.extend(configs)
+        self.owners.extend((r, generation) for _ in configs)
+
+    def _propose(self) -> tuple[dict, int]:
+        """
+        Proposes the candidate with the highest EI across all regions.
+
+        Returns:
+            tuple[dict, int]: The chosen configuration and the index of its region.
+        """
+
+        best = (-np.inf, None, None)
+        for r, region in enumerate(self.regions):
+            if not region.indices:
+                continue
+
+            # Fit the local GP on the most recent in-region data only
+            indices = region.indices[-self.max_region_points:]
+            X = self._encode([self.configs[i] for i in indices])
+            y = np.array([self.evals[i] for i in indices])
+            gp = GaussianProcessRegressor(kernel=Matern(nu=2.5), normalize_y=True, random_state=self.seed)
+            gp.fit(X, y)
+
+            candidates = self._candidates(region.center, region.length, self.n_candidates)
+            if not candidates:
+                continue
+            mu, sigma = gp.predict(self._encode(candidates), return_std=True)
+            self.f_max = region.best
+            acq_values = self._ei(mu, np.maximum(sigma, 1e-9))
+
+            idx = np.argmax(acq_values)
+            if acq_values[idx] > best[0]:
+                best = (acq_values[idx], candidates[idx], r)
+
+        if best[1] is None:
+            # No region could propose, sample uniformly into the first region
+            return self._candidates(None, 1.0, 1)[0], 0
+        return best[1], best[2]
+
+    def ask(self) -> tuple[dict, float]:
+        """
+        Proposes the next hyperparameter configuration and budget to evaluate.
+
+        Returns:
+            tuple[dict, float]: A tuple containing a hyperparameter configuration
+                                and the corresponding budget.
+        """
+
+        # If all configs have been evaluated, return None
+        if self.idx >= self.n_init:
+            return None, self.max_budget
+
+        # If all configs evaluated so far, choose the next config from the regions
+        if len(self.evals) == len(self.configs):
+            config, r = self._propose()
+            self.configs.append(config)
+            self.owners.append((r, self.regions[r].generation))
+
+        # Return next config and budget for evaluation
+        self.idx += 1
+        return self.configs[self.idx - 1].copy(), self.max_budget
+
+    def tell(self, result: float) -> None:
+        """
+        Reports the result of evaluating a configuration.
+
+        Args:
+            result (float): The performance result.
+        """
+
+        self.evals.append(result)
+        i = len(self.evals) - 1
+        r, generation = self.owners[i]
+        region = self.regions[r]
+
+        # Ignore results proposed by a region before it restarted
+        if generation != region.generation:
+            return
+
+        region.indices.append(i)
+        if region.best is None or result > region.best + 1e-3 * abs(region.best):
+            region.successes += 1
+            region.failures = 0
+        else:
+            region.successes = 0
+            region.failures += 1
+
+        if region.best is None or result > region.best:
+            region.best = result
+            region.center = self.configs[i]
+
+        # The initial design only sets the centre
+        if len(region.indices) <= self.n_region_init:
+            region.successes = region.failures = 0
+            return
+
+        # Expand or shrink the region
+        if region.successes >= self.success_tolerance:
+            region.length = min(2 * region.length, self.length_max)
+            region.successes = 0
+        elif region.failures >= self.failure_tolerance:
+            region.length /= 2
+            region.failures = 0
+
+        if region.length < self.length_min:
+            self._restart(r)